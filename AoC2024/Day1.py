@@ -1,4 +1,10 @@
 from collections import Counter
+from itertools import islice
+import heapq
+import os
+import tempfile
+import numpy as np
+
 def read_file(text):
   with open(text, 'r') as file:
     lines = file.readlines()
@@ -44,12 +50,266 @@ def calculate_similarity(lines):
   for number in left_list:
     #print(str(number))
     similarity_score += number * right_count[number]
-    print(str(number) +": " + str(right_count[number]))
 
   return similarity_score
-    
+
+def load_columns(file_path):
+  """
+  Parses the whole file once into two int64 arrays (left column, right column).
+  """
+  values = np.fromfile(file_path, dtype=np.int64, sep=" ")
+  if values.size % 2:
+    raise ValueError("Input must contain pairs of location IDs")
+  columns = values.reshape(-1, 2)
+  return columns[:, 0].copy(), columns[:, 1].copy()
+
+def calculate_distance_vectorized(left, right):
+  """
+  Sums the absolute differences between the sorted columns.
+  """
+  return int(np.abs(np.sort(left) - np.sort(right)).sum())
+
+def calculate_similarity_vectorized(left, right):
+  """
+  Sums each left number times its number of occurrences in the right column,
+  looking the counts up with np.unique/searchsorted instead of a Counter loop.
+  """
+  values, counts = np.unique(right, return_counts=True)
+  if values.size == 0:
+    return 0
+  idx = np.searchsorted(values, left)
+  idx[idx == values.size] = 0
+  matched = np.where(values[idx] == left, counts[idx], 0)
+  return int((left * matched).sum())
+
+# Smallest number of values read from a run file at once, however tight the budget
+MIN_BLOCK_ITEMS = 4096
+
+def _spill_sorted_runs(file_path, run_pairs, tmp_dir):
+  """
+  Reads the input run_pairs lines at a time, sorts both columns of each chunk
+  and spills them as binary int64 run files. Returns (left_runs, right_runs).
+  """
+  left_runs = []
+  right_runs = []
+  with open(file_path, 'r') as file:
+    while True:
+      chunk = list(islice(file, run_pairs))
+      if not chunk:
+        break
+      lines = [line for line in chunk if line.strip()]
+      if not lines:
+        continue
+      columns = np.loadtxt(lines, dtype=np.int64, ndmin=2)
+      for side, column, runs in (("left", columns[:, 0], left_runs), ("right", columns[:, 1], right_runs)):
+        run_path = os.path.join(tmp_dir, f"{side}{len(runs)}.bin")
+        np.sort(column).tofile(run_path)
+        runs.append(run_path)
+  return left_runs, right_runs
+
+def _iter_run(run_path, block_items):
+  """
+  Yields the int64 values of a binary run file, reading block_items at a time.
+  """
+  with open(run_path, 'rb') as run:
+    while True:
+      block = np.fromfile(run, dtype=np.int64, count=block_items)
+      if block.size == 0:
+        return
+      yield from block.tolist()
+
+def _merge_runs(run_paths, block_items):
+  """
+  K-way merges sorted run files into a single sorted stream.
+  """
+  return heapq.merge(*(_iter_run(run_path, block_items) for run_path in run_paths))
+
+def _write_run(sorted_values, run_path, block_items):
+  """
+  Writes a sorted stream to a binary int64 run file, block_items values at a time.
+  """
+  buffer = []
+  with open(run_path, 'wb') as run:
+    for value in sorted_values:
+      buffer.append(value)
+      if len(buffer) >= block_items:
+        np.array(buffer, dtype=np.int64).tofile(run)
+        buffer = []
+    if buffer:
+      np.array(buffer, dtype=np.int64).tofile(run)
+
+def _reduce_runs(run_paths, max_runs, fan_in, block_items, tmp_dir, side):
+  """
+  Merges groups of at most fan_in runs into intermediate runs, pass after pass,
+  until no more than max_runs remain, so the number of open files stays bounded.
+  """
+  merge_pass = 0
+  while len(run_paths) > max_runs:
+    merged_paths = []
+    for group_start in range(0, len(run_paths), fan_in):
+      group = run_paths[group_start:group_start + fan_in]
+      if len(group) == 1:
+        merged_paths.append(group[0])
+        continue
+      merged_path = os.path.join(tmp_dir, f"{side}_pass{merge_pass}_{len(merged_paths)}.bin")
+      _write_run(_merge_runs(group, block_items), merged_path, block_items)
+      for run_path in group:
+        os.remove(run_path)
+      merged_paths.append(merged_path)
+    run_paths = merged_paths
+    merge_pass += 1
+  return run_paths
+
+def _write_frequency_table(sorted_values, table_path, block_items):
+  """
+  Run-length encodes a sorted stream into (value, count) int64 pairs on disk.
+  """
+  buffer = []
+  with open(table_path, 'wb') as table:
+    current, count = None, 0
+    for value in sorted_values:
+      if value == current:
+        count += 1
+        continue
+      if count:
+        buffer += (current, count)
+      current, count = value, 1
+      if len(buffer) >= block_items:
+        np.array(buffer, dtype=np.int64).tofile(table)
+        buffer = []
+    if count:
+      buffer += (current, count)
+    if buffer:
+      np.array(buffer, dtype=np.int64).tofile(table)
+
+def calculate_distance_and_similarity_external(file_path, memory_budget=64 * 1024 * 1024, fan_in=64):
+  """
+  External-memory variant for location lists larger than RAM. Sorted runs are
+  spilled to temp files and merged in lockstep for the distance; the right
+  column is written out as an on-disk frequency table which is merge-joined
+  against the sorted left column for the similarity.
+  memory_budget (bytes) is an approximate bound on the peak working set and
+  fan_in caps how many run files are open at once; when there are more runs,
+  they are first merged into intermediate runs over several passes.
+  """
+  run_pairs = max(1, memory_budget // 128)  # line strings dominate while reading
+  fan_in = max(fan_in, 2)
+
+  with tempfile.TemporaryDirectory() as tmp_dir:
+    left_runs, right_runs = _spill_sorted_runs(file_path, run_pairs, tmp_dir)
+
+    # At most fan_in + 1 files are open in any merge, each read in blocks
+    block_items = max(MIN_BLOCK_ITEMS, memory_budget // (64 * (fan_in + 1)))
+
+    # The lockstep merge keeps both columns open together, so each gets half the fan-in
+    left_runs = _reduce_runs(left_runs, fan_in // 2, fan_in, block_items, tmp_dir, "left")
+    right_runs = _reduce_runs(right_runs, fan_in // 2, fan_in, block_items, tmp_dir, "right")
+
+    # Distance: walk both merged columns in lockstep, recording the right
+    # column's frequencies on disk along the way
+    total_distance = 0
+    def distance_pairs():
+      nonlocal total_distance
+      for left, right in zip(_merge_runs(left_runs, block_items), _merge_runs(right_runs, block_items)):
+        total_distance += abs(left - right)
+        yield right
+
+    table_path = os.path.join(tmp_dir, "right_counts.bin")
+    _write_frequency_table(distance_pairs(), table_path, block_items)
+
+    # Similarity: merge-join the sorted left column against the frequency table
+    similarity_score = 0
+    table = _iter_run(table_path, block_items)
+    counts = zip(table, table)
+    value, count = next(counts, (None, 0))
+    for number in _merge_runs(left_runs, block_items):
+      while value is not None and value < number:
+        value, count = next(counts, (None, 0))
+      if value == number:
+        similarity_score += number * count
+
+  return total_distance, similarity_score
+
+class IncrementalLocationLists:
+  """
+  Keeps the balance #left <= t - #right <= t over the distinct IDs seen so far,
+  plus per-column counts, so that the distance and similarity can be read
+  after every appended pair without a full recompute.
+  """
+
+  def __init__(self, left_list=(), right_list=()):
+    left_sorted = np.sort(np.asarray(left_list, dtype=np.int64))
+    right_sorted = np.sort(np.asarray(right_list, dtype=np.int64))
+    if left_sorted.size != right_sorted.size:
+      raise ValueError("Both lists must have the same length")
+
+    # balance[k] is the balance on [points[k], points[k + 1]); after the last point it is 0
+    self.points = np.unique(np.concatenate((left_sorted, right_sorted)))
+    self.balance = (np.searchsorted(left_sorted, self.points, side='right')
+                    - np.searchsorted(right_sorted, self.points, side='right'))
+    self.total_distance = int((np.abs(self.balance[:-1]) * np.diff(self.points)).sum())
+
+    self.left_count = Counter(left_sorted.tolist())
+    self.right_count = Counter(right_sorted.tolist())
+    self.similarity_score = sum(number * count * self.right_count[number] for number, count in self.left_count.items())
+
+  def append(self, left, right):
+    """
+    Adds one (left, right) pair and updates both running totals.
+    """
+    # Similarity: O(1), the new left number meets the existing right counts
+    # and the new right number meets the (already updated) left counts
+    self.similarity_score += left * self.right_count[left]
+    self.left_count[left] += 1
+    self.similarity_score += right * self.left_count[right]
+    self.right_count[right] += 1
+
+    if left < right:
+      self.total_distance += self._distance_delta(left, right, 1)
+    elif right < left:
+      self.total_distance += self._distance_delta(right, left, -1)
+    return self.total_distance, self.similarity_score
+
+  def _point_index(self, value):
+    """
+    Returns the index of value in points, inserting it as a new breakpoint
+    that inherits the balance of the segment it splits.
+    """
+    index = int(np.searchsorted(self.points, value))
+    if index == self.points.size or self.points[index] != value:
+      inherited = self.balance[index - 1] if index else 0
+      self.points = np.insert(self.points, index, value)
+      self.balance = np.insert(self.balance, index, inherited)
+    return index
+
+  def _distance_delta(self, low, high, step):
+    """
+    The distance equals the integral of |#left <= t - #right <= t| over t, and
+    appending a pair shifts that balance by step only on [low, high). Each
+    segment there grows by its width where the balance moves away from zero
+    and shrinks where it moves towards it. The breakpoint insert and the
+    update are O(n) array operations, so an append costs far less than a full
+    re-sort but is not logarithmic.
+    """
+    low_index = self._point_index(low)
+    high_index = self._point_index(high)
+    segments = self.balance[low_index:high_index]
+    widths = np.diff(self.points[low_index:high_index + 1])
+    delta = int(np.where(segments * step >= 0, widths, -widths).sum())
+    segments += step
+    return delta
+
+left_column, right_column = load_columns("input1.txt")
+
 #part 1
-#print(calculate_distance(read_file("input1.txt")))
+print(calculate_distance_vectorized(left_column, right_column))
 
 #part 2
-print(calculate_similarity(read_file("input1.txt")))
\ No newline at end of file
+print(calculate_similarity_vectorized(left_column, right_column))
+
+#external-memory mode for inputs larger than RAM (both parts)
+#print(calculate_distance_and_similarity_external("input1.txt"))
+
+#incremental mode: running totals after every appended pair
+#location_lists = IncrementalLocationLists(left_column.tolist(), right_column.tolist())
+#print(location_lists.append(12345, 54321))
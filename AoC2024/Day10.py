@@ -103,6 +103,46 @@ def calculate_total_trail_score(input_map):
     return total_score
 
 
+def calculate_trail_totals(input_map):
+    """
+    Calculates the total trail score and the total trail rating in one sweep over
+    the heights from 9 down to 0. Every cell gets the number of trails from it to
+    a 9 (its rating) and a bitset of the 9s it can reach, packed into a Python int
+    (its score is the number of set bits); both are summed from its neighbors one
+    level higher. Returns (total score, total rating).
+    """
+    topographic_map = parse_topographic_map(input_map)
+    rows, cols = len(topographic_map), len(topographic_map[0])
+    heights = [height for row in topographic_map for height in row]
+
+    # Bucket the flat cell indices by height once
+    layers = [[] for _ in range(10)]
+    for index, height in enumerate(heights):
+        layers[height].append(index)
+
+    trail_counts = [0] * len(heights)
+    reachable_nines = [0] * len(heights)
+    for bit, index in enumerate(layers[9]):
+        trail_counts[index] = 1
+        reachable_nines[index] = 1 << bit
+
+    for height in range(8, -1, -1):
+        for index in layers[height]:
+            x = index % cols
+            count = 0
+            nines = 0
+            for neighbor in (index - cols, index + cols, index - 1 if x > 0 else -1, index + 1 if x < cols - 1 else -1):
+                if 0 <= neighbor < len(heights) and heights[neighbor] == height + 1:
+                    count += trail_counts[neighbor]
+                    nines |= reachable_nines[neighbor]
+            trail_counts[index] = count
+            reachable_nines[index] = nines
+
+    total_score = sum(reachable_nines[index].bit_count() for index in layers[0])
+    total_rating = sum(trail_counts[index] for index in layers[0])
+    return total_score, total_rating
+
+
 # Example input
 example_map = """
 89010123
@@ -122,10 +162,13 @@ if os.path.exists(file_path):
 
 example_map=input_data
 
-# Calculate the total trail score for the example map
-total_trail_score = calculate_total_trail_score(example_map)
-print("Part 1: " + str(total_trail_score))
+# Calculate the total trail score and rating for the example map in one sweep
+total_trail_score, total_trail_rating = calculate_trail_totals(example_map)
+
+# One search per trailhead
+#total_trail_score = calculate_total_trail_score(example_map)
+#total_trail_rating = calculate_total_trail_rating(example_map)
 
-# Calculate the total trail rating for the example map
-total_trail_rating = calculate_total_trail_rating(example_map)
+print("Part 1: " + str(total_trail_score))
 print("Part 2: " + str(total_trail_rating))
+
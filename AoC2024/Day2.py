@@ -1,12 +1,32 @@
-def is_report_safe(report):
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
 
-    differences = [report[i + 1] - report[i] for i in range(len(report) - 1)]
+def find_violation(report, direction, skipped=()):
+    """
+    Walks the report once, ignoring the indices in skipped, and returns the index
+    pair (previous, current) of the first step that is not 1-3 in the given
+    direction (1 for increasing, -1 for decreasing), or None if every step is fine.
+    """
+    previous = None
+    for current in range(len(report)):
+        if current in skipped:
+            continue
+        if previous is not None and not 0 < (report[current] - report[previous]) * direction <= 3:
+            return previous, current
+        previous = current
+    return None
 
-    # Check if all differences are increasing or all are decreasing
-    all_increasing = all(0 < diff <= 3 for diff in differences)
-    all_decreasing = all(-3 <= diff < 0 for diff in differences)
 
-    return all_increasing or all_decreasing
+def is_report_safe(report):
+    if len(report) < 2:
+        return True
+
+    # The first difference decides whether the report has to be increasing or decreasing
+    direction = 1 if report[1] > report[0] else -1
+    return find_violation(report, direction) is None
 
 def count_safe_reports(file_path):
     safe_count = 0
@@ -20,14 +40,32 @@ def count_safe_reports(file_path):
 
     return safe_count
 
-def can_be_safe_with_dampener(report):
+def is_safe_in_direction(report, direction, max_removals, skipped=()):
+    """
+    Checks if the report can be made safe in the given direction by removing at most
+    max_removals levels. Any fix has to drop one of the two levels of the first
+    violating step, so only those two removals are tried: O(2^k * n) for k removals.
+    """
+    violation = find_violation(report, direction, skipped)
+    if violation is None:
+        return True
+    if max_removals == 0:
+        return False
+    previous, current = violation
+    return (is_safe_in_direction(report, direction, max_removals - 1, skipped + (current,)) or
+            is_safe_in_direction(report, direction, max_removals - 1, skipped + (previous,)))
 
-    for i in range(len(report)):
-        # Create a new report with the current level removed
-        modified_report = report[:i] + report[i+1:]
-        if is_report_safe(modified_report):
-            return True
-    return False
+
+def is_safe_with_removals(report, max_removals):
+    """
+    Checks if the report is safe after removing at most max_removals levels.
+    """
+    return (is_safe_in_direction(report, 1, max_removals) or
+            is_safe_in_direction(report, -1, max_removals))
+
+
+def can_be_safe_with_dampener(report):
+    return is_safe_with_removals(report, 1)
 
 
 def count_safe_reports_with_dampener(file_path):
@@ -43,14 +81,178 @@ def count_safe_reports_with_dampener(file_path):
     return safe_count
 
 
-# Path to the input file
-file_path = "input2.txt"
+def pad_reports(values, lengths):
+    """
+    Packs the flat level values into a zero-padded 2-D int64 array, one row
+    of lengths[i] levels per report.
+    """
+    width = int(lengths.max(initial=0))
+    levels = np.zeros((len(lengths), width), dtype=np.int64)
+    # Row-major boolean assignment fills each row left to right
+    levels[np.arange(width) < lengths[:, None]] = values
+    return levels, lengths
+
+
+def build_report_array(lines):
+    """
+    Packs report lines into a zero-padded 2-D int64 array (one row per report)
+    together with the length of each report.
+    """
+    reports = [line.split() for line in lines if line.strip()]
+
+    lengths = np.fromiter(map(len, reports), dtype=np.int64, count=len(reports))
+    values = np.fromiter(map(int, chain.from_iterable(reports)), dtype=np.int64, count=int(lengths.sum()))
+    return pad_reports(values, lengths)
+
+
+def parse_report_bytes(data):
+    """
+    Same layout as build_report_array, parsed straight from raw bytes with
+    numpy so no Python object is created per level or per line.
+    """
+    raw = np.frombuffer(data, dtype=np.uint8)
+    is_space = (raw == ord(" ")) | ((raw >= ord("\t")) & (raw <= ord("\r")))
+    token_starts = np.flatnonzero(~is_space & np.concatenate(([True], is_space[:-1])))
+    # fromstring reads an all-whitespace buffer as a single 0, hence the guard
+    values = np.fromstring(data, dtype=np.int64, sep=" ") if token_starts.size else token_starts
+    if token_starts.size != values.size:
+        raise ValueError("Reports must contain only whitespace-separated integers")
+
+    # Report number of each level = number of newlines before it, empty lines dropped
+    newlines = np.flatnonzero(raw == ord("\n"))
+    lengths = np.bincount(np.searchsorted(newlines, token_starts), minlength=newlines.size + 1)
+    return pad_reports(values, lengths[lengths > 0])
+
+
+def load_reports(file_path):
+    """
+    Reads every report once into the padded array layout of build_report_array.
+    """
+    with open(file_path, 'r') as file:
+        return build_report_array(file)
+
+
+def evaluate_reports_batch(levels, lengths):
+    """
+    Evaluates all reports at once and returns the (part 1, part 2) safe counts.
+    For the dampener every single-level removal is checked in the same pass:
+    removing level j keeps the steps before j - 1 and after j (prefix/suffix
+    AND-accumulations of the step masks) and joins its neighbours into one step.
+    """
+    count, width = levels.shape
+    positions = np.arange(width)
+    differences = np.diff(levels, axis=1)
+    step_in_report = positions[:-1] < (lengths - 1)[:, None]
+
+    # Step across a removed level j: levels[j + 1] - levels[j - 1]
+    joined = np.zeros((count, width), dtype=np.int64)
+    joined[:, 1:-1] = levels[:, 2:] - levels[:, :-2]
+    joined_in_report = (positions >= 1) & (positions + 1 < lengths[:, None])
+    removable = positions < lengths[:, None]
+
+    safe = np.zeros(count, dtype=bool)
+    dampened = np.zeros(count, dtype=bool)
+    for direction in (1, -1):
+        # Steps outside a report's length are treated as fine
+        steps_ok = ~step_in_report | ((differences * direction >= 1) & (differences * direction <= 3))
+        joined_ok = ~joined_in_report | ((joined * direction >= 1) & (joined * direction <= 3))
+
+        # prefix[:, j] -> steps 0..j-2 are fine, suffix[:, j] -> steps j+1.. are fine
+        prefix = np.ones((count, width), dtype=bool)
+        prefix[:, 2:] = np.logical_and.accumulate(steps_ok, axis=1)[:, :width - 2]
+        suffix = np.ones((count, width), dtype=bool)
+        suffix[:, :width - 2] = np.logical_and.accumulate(steps_ok[:, ::-1], axis=1)[:, ::-1][:, 1:]
+
+        safe |= steps_ok.all(axis=1)
+        dampened |= (removable & prefix & joined_ok & suffix).any(axis=1)
+
+    return int(safe.sum()), int((safe | dampened).sum())
+
+
+def count_safe_reports_batch(file_path):
+    """
+    Loads the file once and returns both safe report counts together.
+    """
+    levels, lengths = load_reports(file_path)
+    return evaluate_reports_batch(levels, lengths)
+
+
+def split_file_ranges(file_path, chunks):
+    """
+    Splits the file into at most `chunks` byte ranges (start, end) whose
+    boundaries fall just after a newline, so no report is cut in two.
+    """
+    size = os.path.getsize(file_path)
+    boundaries = [0]
+    with open(file_path, 'rb') as file:
+        for i in range(1, chunks):
+            offset = size * i // chunks
+            if offset <= boundaries[-1]:
+                continue
+            file.seek(offset - 1)
+            file.readline()  # move to the start of the next line
+            position = file.tell()
+            if boundaries[-1] < position < size:
+                boundaries.append(position)
+    boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def count_safe_reports_in_range(file_path, start, end, batch_bytes=1024 * 1024):
+    """
+    Worker: counts the (part 1, part 2) safe reports in one byte range of the
+    file, reading it in newline-aligned batches of about batch_bytes so the
+    memory used stays bounded whatever the size of the range.
+    """
+    safe_reports1 = safe_reports2 = 0
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        position = start
+        while position < end:
+            data = file.read(min(batch_bytes, end - position))
+            if position + len(data) < end and not data.endswith(b"\n"):
+                data += file.readline()  # finish the last report of the batch
+            position += len(data)
+            part1, part2 = evaluate_reports_batch(*parse_report_bytes(data))
+            safe_reports1 += part1
+            safe_reports2 += part2
+    return safe_reports1, safe_reports2
+
+
+def count_safe_reports_parallel(file_path, workers=None, max_range_bytes=32 * 1024 * 1024):
+    """
+    Splits a large report file into newline-aligned byte ranges of at most about
+    max_range_bytes, counts each range in a process pool and sums the partial
+    counts.
+    """
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(file_path)
+    ranges = split_file_ranges(file_path, max(workers, -(-size // max_range_bytes)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partials = executor.map(count_safe_reports_in_range,
+                                [file_path] * len(ranges),
+                                [start for start, end in ranges],
+                                [end for start, end in ranges])
+        safe_reports1 = safe_reports2 = 0
+        for part1, part2 in partials:
+            safe_reports1 += part1
+            safe_reports2 += part2
+    return safe_reports1, safe_reports2
+
+
+if __name__ == "__main__":
+    # Path to the input file
+    file_path = "input2.txt"
+
+    #part1 and part2 in one batched pass
+    safe_reports1, safe_reports2 = count_safe_reports_batch(file_path)
 
-#part1
-safe_reports1 = count_safe_reports(file_path)
+    #multi-GB report files: newline-aligned chunks across a process pool
+    #safe_reports1, safe_reports2 = count_safe_reports_parallel(file_path)
 
-#part2
-safe_reports2 = count_safe_reports_with_dampener(file_path)
+    #one report at a time
+    #safe_reports1 = count_safe_reports(file_path)
+    #safe_reports2 = count_safe_reports_with_dampener(file_path)
 
-print(f"The number of safe reports in part 1 is: {safe_reports1}")
-print(f"The number of safe reports in part 2 is: {safe_reports2}")
\ No newline at end of file
+    print(f"The number of safe reports in part 1 is: {safe_reports1}")
+    print(f"The number of safe reports in part 2 is: {safe_reports2}")
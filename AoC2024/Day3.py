@@ -1,4 +1,8 @@
+import mmap
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
 #part1
 def sum_valid_mul_instructions(file_path):
@@ -57,13 +61,261 @@ def sum_valid_mul_with_conditions(file_path):
 
     return total_sum
 
-# Path to the input file
-file_path = "input3.txt"  # Replace with your file name
+#both parts in a single pass
+WHITESPACE = b" \t\n\r\x0b\x0c"
+# Longest `X,Y)` part of a mul instruction that is still read; anything longer is invalid
+MAX_ARGUMENT_BYTES = 32
 
-# Calculate and display the sum of valid mul instructions
-result = sum_valid_mul_instructions(file_path)
-print(f"Part 1: The sum of all valid mul instructions is: {result}")
 
-# Calculate and display the sum of valid mul instructions
-result = sum_valid_mul_with_conditions(file_path)
-print(f"Part 2: The sum of all valid mul instructions (with conditions) is: {result}")
+def read_number(buffer, pos, end):
+    """
+    Reads the decimal number starting at pos without slicing the buffer.
+    Returns (value, next position), value is None if there are no digits.
+    """
+    start = pos
+    value = 0
+    while pos < end and 48 <= buffer[pos] <= 57:  # b'0' .. b'9'
+        value = value * 10 + buffer[pos] - 48
+        pos += 1
+    return (value if pos > start else None), pos
+
+
+def parse_mul_arguments(buffer, pos, end):
+    """
+    Parses the `X,Y)` part of a `mul(X,Y)` instruction starting at pos (just after
+    the opening bracket). Returns (product, next position), product is None if the
+    instruction is not valid; the position then points at the offending byte.
+    Arguments longer than MAX_ARGUMENT_BYTES are rejected, so a `mul(` followed
+    by an endless run of digits or whitespace costs bounded time.
+    """
+    end = min(end, pos + MAX_ARGUMENT_BYTES)
+    while pos < end and buffer[pos] in WHITESPACE:
+        pos += 1
+    x, pos = read_number(buffer, pos, end)
+    if x is None:
+        return None, pos
+    while pos < end and buffer[pos] in WHITESPACE:
+        pos += 1
+    if pos >= end or buffer[pos] != 44:  # b','
+        return None, pos
+    pos += 1
+    while pos < end and buffer[pos] in WHITESPACE:
+        pos += 1
+    y, pos = read_number(buffer, pos, end)
+    if y is None:
+        return None, pos
+    while pos < end and buffer[pos] in WHITESPACE:
+        pos += 1
+    if pos >= end or buffer[pos] != 41:  # b')'
+        return None, pos
+    return x * y, pos + 1
+
+
+def scan_instructions(buffer, start=0, end=None, is_enabled=True):
+    """
+    Scans the instructions that start in buffer[start:end] once for `mul(X,Y)`,
+    `do()` and `don't()`, jumping between candidates with bytes.find. An
+    instruction starting before end is read to completion even past end.
+    Returns (sum of all mul instructions, sum of enabled mul instructions,
+    enabled state at the end).
+    """
+    size = len(buffer)
+    if end is None:
+        end = size
+
+    def find(token, pos):
+        found = buffer.find(token, pos, min(end + len(token) - 1, size))
+        return end if found == -1 else found
+
+    total_sum = 0
+    enabled_sum = 0
+    next_mul = find(b"mul(", start)
+    next_do = find(b"do()", start)
+    next_dont = find(b"don't()", start)
+
+    while True:
+        pos = min(next_mul, next_do, next_dont)
+        if pos >= end:
+            break
+        if pos == next_do:
+            is_enabled = True
+            next_do = find(b"do()", pos + 4)
+        elif pos == next_dont:
+            is_enabled = False
+            next_dont = find(b"don't()", pos + 7)
+        else:
+            product, pos = parse_mul_arguments(buffer, pos + 4, size)
+            if product is not None:
+                total_sum += product
+                if is_enabled:
+                    enabled_sum += product
+            next_mul = find(b"mul(", pos)
+
+    return total_sum, enabled_sum, is_enabled
+
+
+def sum_mul_instructions_single_pass(file_path):
+    """
+    Memory-maps the input file and returns the part 1 and part 2 sums from one scan.
+    """
+    if os.path.getsize(file_path) == 0:
+        return 0, 0
+    with open(file_path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            total_sum, enabled_sum, _ = scan_instructions(buffer)
+    return total_sum, enabled_sum
+
+
+#streaming scan with bounded memory
+class InstructionStream:
+    """
+    Incremental scanner: feed() it bytes as they arrive and read the running
+    (part 1, part 2) sums with result(). Only a short tail that could still be
+    the start of an instruction is carried over between feeds.
+    """
+
+    def __init__(self):
+        self.carry = b""
+        self.total_sum = 0
+        self.enabled_sum = 0
+        self.is_enabled = True
+
+    def feed(self, data):
+        buffer = self.carry + bytes(data)
+
+        # Anything starting in the last 6 bytes may be a cut-off do()/don't()/mul(,
+        # and a trailing mul( whose arguments run to the end may still complete
+        cutoff = max(len(buffer) - 6, 0)
+        # Any mul( starting before cutoff counts, even if its "(" lies past it.
+        # Its arguments are capped, so only a recent one can still be open and
+        # the carry stays a few dozen bytes long.
+        last_mul = buffer.rfind(b"mul(", max(cutoff - MAX_ARGUMENT_BYTES, 0), cutoff + 3)
+        if last_mul != -1:
+            product, pos = parse_mul_arguments(buffer, last_mul + 4, len(buffer))
+            if product is None and pos >= len(buffer):
+                cutoff = last_mul
+
+        total_sum, enabled_sum, self.is_enabled = scan_instructions(buffer, 0, cutoff, self.is_enabled)
+        self.total_sum += total_sum
+        self.enabled_sum += enabled_sum
+        self.carry = buffer[cutoff:]
+
+    def result(self):
+        """
+        Returns the sums as if the stream ended now; the stream can still be fed afterwards.
+        """
+        total_sum, enabled_sum, _ = scan_instructions(self.carry, 0, None, self.is_enabled)
+        return self.total_sum + total_sum, self.enabled_sum + enabled_sum
+
+
+# Instruction strings fed to InstructionStream split at every position
+STREAM_SPLIT_EXAMPLES = [
+    b"mul(2,3)",
+    b"xxxxxxxxmul(2,3)",
+    b"xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))",
+    b"do()mul( 12 , 34 )don't()mul(5,6)do()mul(7,8)",
+    b"mul(" + b" " * MAX_ARGUMENT_BYTES + b"1,2)mul(3,4)",
+    b"mul(1,2" + b" " * (MAX_ARGUMENT_BYTES - 4) + b")mul(3,4)",
+]
+
+
+def check_stream_splits(examples=STREAM_SPLIT_EXAMPLES):
+    """
+    Regression check: feeding an example in two parts, split at any position,
+    must give the same sums as scanning it in one piece.
+    """
+    for data in examples:
+        expected_sum, expected_enabled_sum, _ = scan_instructions(data)
+        for split in range(len(data) + 1):
+            scanner = InstructionStream()
+            scanner.feed(data[:split])
+            scanner.feed(data[split:])
+            assert scanner.result() == (expected_sum, expected_enabled_sum), (data, split)
+
+
+def sum_mul_instructions_stream(stream, chunk_size=64 * 1024):
+    """
+    Reads a binary stream (e.g. sys.stdin.buffer) chunk by chunk at constant memory.
+    """
+    scanner = InstructionStream()
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        scanner.feed(chunk)
+    return scanner.result()
+
+
+#parallel scan for huge inputs
+def scan_chunk(file_path, start, end):
+    """
+    Worker: scans the instructions starting in [start, end) without knowing the
+    enable state at start. Returns (sum of all mul instructions, enabled sum if
+    the chunk starts enabled, enabled sum if it starts disabled, enable state at
+    the end or None when the chunk has no do()/don't()).
+    """
+    with open(file_path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            # Only the mul instructions before the first do()/don't() depend on the incoming state
+            toggles = [found for found in (buffer.find(b"do()", start, end + 3),
+                                           buffer.find(b"don't()", start, end + 6))
+                       if found != -1 and found < end]
+            first_toggle = min(toggles, default=end)
+            prefix_sum, _, _ = scan_instructions(buffer, start, first_toggle)
+            rest_sum, rest_enabled_sum, is_enabled = scan_instructions(buffer, first_toggle, end)
+
+    final_state = is_enabled if toggles else None
+    return prefix_sum + rest_sum, prefix_sum + rest_enabled_sum, rest_enabled_sum, final_state
+
+
+def sum_mul_instructions_parallel(file_path, workers=None, chunks=None):
+    """
+    Splits the file into byte chunks, scans them in a process pool and folds the
+    partial results left to right, carrying the enable state between chunks.
+    Each instruction is owned by the chunk it starts in.
+    """
+    size = os.path.getsize(file_path)
+    if size == 0:
+        return 0, 0
+    workers = workers or os.cpu_count() or 1
+    chunks = min(chunks or workers * 4, size)
+    boundaries = [size * i // chunks for i in range(chunks + 1)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partials = executor.map(scan_chunk, [file_path] * chunks, boundaries[:-1], boundaries[1:])
+
+        total_sum = 0
+        enabled_sum = 0
+        is_enabled = True
+        for chunk_sum, sum_if_enabled, sum_if_disabled, final_state in partials:
+            total_sum += chunk_sum
+            enabled_sum += sum_if_enabled if is_enabled else sum_if_disabled
+            if final_state is not None:
+                is_enabled = final_state
+
+    return total_sum, enabled_sum
+
+
+if __name__ == "__main__":
+    # Path to the input file
+    file_path = "input3.txt"  # Replace with your file name
+
+    if sys.argv[1:] == ["-"]:
+        # Piped input, e.g. `cat input3.txt | python Day3.py -`
+        result1, result2 = sum_mul_instructions_stream(sys.stdin.buffer)
+    else:
+        # Calculate both sums with the single-pass scanner
+        result1, result2 = sum_mul_instructions_single_pass(file_path)
+
+    # Huge inputs: chunks scanned in a process pool
+    #result1, result2 = sum_mul_instructions_parallel(file_path)
+
+    # Regex based versions, one scan per part
+    #result1 = sum_valid_mul_instructions(file_path)
+    #result2 = sum_valid_mul_with_conditions(file_path)
+
+    # Feeding the stream scanner in pieces must not lose instructions
+    #check_stream_splits()
+
+    # Calculate and display the sum of valid mul instructions
+    print(f"Part 1: The sum of all valid mul instructions is: {result1}")
+
+    # Calculate and display the sum of valid mul instructions
+    print(f"Part 2: The sum of all valid mul instructions (with conditions) is: {result2}")
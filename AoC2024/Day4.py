@@ -1,3 +1,12 @@
+import numpy as np
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# All 8 search directions (dx, dy)
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1), (0, -1), (-1, 0), (-1, -1), (-1, 1)]
+
+
 def count_word_in_grid(grid, word):
     """
     Counts all occurrences of the given word in the grid in all possible directions.
@@ -43,19 +52,115 @@ def read_grid(file_path):
         return [line.strip() for line in file]
 
 
-# Path to the input file
-file_path = "input4.txt"  # Replace with your file name
+def grid_to_array(grid, pad=0):
+    """
+    Converts the grid into a uint8 array of character codes, surrounded by a
+    border of `pad` zero bytes so shifted slices never leave the array.
+    """
+    rows, cols = len(grid), len(grid[0])
+    array = np.zeros((rows + 2 * pad, cols + 2 * pad), dtype=np.uint8)
+    array[pad:pad + rows, pad:pad + cols] = np.frombuffer("".join(grid).encode(), dtype=np.uint8).reshape(rows, cols)
+    return array
+
+
+def count_word_in_grid_vectorized(grid, word):
+    """
+    Counts the word in all 8 directions with NumPy: for every direction the i-th
+    letter is compared against the padded grid shifted by i steps and the
+    comparisons are AND-ed together. Returns ({(dx, dy): count}, total count).
+    """
+    rows, cols = len(grid), len(grid[0])
+    pad = len(word) - 1
+    array = grid_to_array(grid, pad)
+    direction_counts = count_word_in_array(array, word, pad, pad, rows, cols)
+    return direction_counts, sum(direction_counts.values())
+
 
-# Define the word to search for
-word_to_find = "XMAS"
+def count_word_in_array(array, word, top, left, rows, cols):
+    """
+    Counts, per direction, the matches starting in array[top:top + rows, left:left + cols].
+    The array must hold len(word) - 1 cells of context or zero padding around that window.
+    """
+    direction_counts = {}
+    for dx, dy in DIRECTIONS:
+        matches = np.ones((rows, cols), dtype=bool)
+        for i, letter in enumerate(word.encode()):
+            x, y = top + dx * i, left + dy * i
+            matches &= array[x:x + rows, y:y + cols] == letter
+        direction_counts[(dx, dy)] = int(matches.sum())
+    return direction_counts
 
-# Read the grid and count occurrences
-grid = read_grid(file_path)
-result = count_word_in_grid(grid, word_to_find)
-print(f"Part 1: The word '{word_to_find}' appears {result} times in the grid.")
 
+def grid_lines(grid):
+    """
+    Extracts every row, column, diagonal and anti-diagonal of the grid once,
+    each both forward and reversed, so all 8 directions are plain strings.
+    """
+    array = grid_to_array(grid)
+    rows, cols = array.shape
+    flipped = np.fliplr(array)
+    lines = [row.tobytes().decode() for row in array]
+    lines += [column.tobytes().decode() for column in array.T]
+    lines += [array.diagonal(offset).tobytes().decode() for offset in range(1 - rows, cols)]
+    lines += [flipped.diagonal(offset).tobytes().decode() for offset in range(1 - rows, cols)]
+    return lines + [line[::-1] for line in lines]
 
-#part 2 (does not work with real data, only test data)
+
+def build_automaton(words):
+    """
+    Builds an Aho-Corasick automaton: a trie (goto), failure links and, for
+    every state, the indices of the words that end there.
+    """
+    goto = [{}]
+    output = [[]]
+    for index, word in enumerate(words):
+        node = 0
+        for char in word:
+            if char not in goto[node]:
+                goto[node][char] = len(goto)
+                goto.append({})
+                output.append([])
+            node = goto[node][char]
+        output[node].append(index)
+
+    # Breadth-first, so the failure link of a parent is always known before its children
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        node = queue.popleft()
+        for char, child in goto[node].items():
+            state = fail[node]
+            while state and char not in goto[state]:
+                state = fail[state]
+            fail[child] = goto[state].get(char, 0) if node else 0
+            output[child] = output[child] + output[fail[child]]
+            queue.append(child)
+
+    return goto, fail, output
+
+
+def count_words_in_grid(grid, words):
+    """
+    Counts every word of a vocabulary in all 8 directions with one Aho-Corasick
+    pass over the grid lines. Returns {word: count}.
+    """
+    words = list(dict.fromkeys(words))
+    goto, fail, output = build_automaton(words)
+    counts = [0] * len(words)
+
+    for line in grid_lines(grid):
+        node = 0
+        for char in line:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in output[node]:
+                counts[index] += 1
+
+    return dict(zip(words, counts))
+
+
+#part 2 (does not work with real data, only test data, see count_stencils below)
 def count_x_mas_by_centers(grid):
     """
     Counts all occurrences of the X-MAS pattern in the grid, including diagonal patterns.
@@ -118,10 +223,143 @@ example_grid_with_centers = [
 ]
 
 # Count X-MAS occurrences in the example input starting from centers
-result_with_centers = count_x_mas_by_centers(example_grid_with_centers)
-print(result_with_centers)#example data
+#result_with_centers = count_x_mas_by_centers(example_grid_with_centers)
+#print(result_with_centers)#example data
+
+
+#part 2 with stencils
+def stencil_rotations(stencil):
+    """
+    Returns the distinct 90 degree rotations of a stencil (a list of equal-length strings).
+    """
+    rotations = []
+    for _ in range(4):
+        if stencil not in rotations:
+            rotations.append(stencil)
+        stencil = ["".join(column) for column in zip(*stencil[::-1])]
+    return rotations
+
+
+# X-MAS: two diagonal MAS/SAM crossing at the A, '.' is a wildcard
+X_MAS_STENCILS = stencil_rotations([
+    "M.S",
+    ".A.",
+    "M.S",
+])
+
+
+def count_stencil_matches(grid, stencil, wildcard="."):
+    """
+    Counts the positions where the stencil matches the grid. Every non-wildcard
+    cell of the stencil is compared against a shifted view of the whole grid at
+    once and the comparisons are AND-ed together.
+    """
+    array = grid_to_array(grid)
+    rows, cols = array.shape
+    height, width = len(stencil), len(stencil[0])
+    if height > rows or width > cols:
+        return 0
+
+    out_rows, out_cols = rows - height + 1, cols - width + 1
+    matches = np.ones((out_rows, out_cols), dtype=bool)
+    for dx, stencil_row in enumerate(stencil):
+        for dy, char in enumerate(stencil_row):
+            if char != wildcard:
+                matches &= array[dx:dx + out_rows, dy:dy + out_cols] == ord(char)
+    return int(matches.sum())
+
+
+def count_stencils(grid, stencils, wildcard="."):
+    """
+    Sums the matches of several stencils, e.g. all rotations of a pattern.
+    """
+    return sum(count_stencil_matches(grid, stencil, wildcard) for stencil in stencils)
+
+
+#giant grids: row bands with a halo, counted in a process pool
+def grid_file_shape(file_path):
+    """
+    Returns (rows, cols, stride) of a rectangular grid file without reading it;
+    stride is the length of one line in bytes including its line ending.
+    """
+    with open(file_path, 'rb') as file:
+        first_line = file.readline()
+    stride = len(first_line)
+    cols = len(first_line.rstrip(b"\r\n"))
+    rows = -(-os.path.getsize(file_path) // stride) if stride else 0
+    return rows, cols, stride
+
+
+def read_grid_rows(file_path, first_row, last_row, stride, cols):
+    """
+    Reads rows [first_row, last_row) straight from disk into a uint8 array.
+    """
+    with open(file_path, 'rb') as file:
+        file.seek(first_row * stride)
+        data = file.read((last_row - first_row) * stride)
+    # The last line may lack its line ending
+    data = data.ljust((last_row - first_row) * stride, b"\n")
+    return np.frombuffer(data, dtype=np.uint8).reshape(last_row - first_row, stride)[:, :cols]
+
+
+def count_word_in_band(file_path, word, first_row, last_row, rows, cols, stride):
+    """
+    Worker: counts the matches that start in rows [first_row, last_row). The band
+    is read with len(word) - 1 halo rows on each side so matches leaving the band
+    are still seen, but each match is only counted by the band owning its start.
+    """
+    pad = len(word) - 1
+    top, bottom = max(first_row - pad, 0), min(last_row + pad, rows)
+    band = read_grid_rows(file_path, top, bottom, stride, cols)
+
+    array = np.zeros((bottom - top + 2 * pad, cols + 2 * pad), dtype=np.uint8)
+    array[pad:pad + bottom - top, pad:pad + cols] = band
+    return count_word_in_array(array, word, pad + first_row - top, pad, last_row - first_row, cols)
+
+
+def count_word_in_grid_tiled(file_path, word, band_rows=1024, workers=None):
+    """
+    Splits the grid file into bands of band_rows rows, streams each band from
+    disk in a process pool and sums the per-direction counts.
+    Returns ({(dx, dy): count}, total count) like count_word_in_grid_vectorized.
+    """
+    rows, cols, stride = grid_file_shape(file_path)
+    bands = [(first_row, min(first_row + band_rows, rows)) for first_row in range(0, rows, band_rows)]
+
+    direction_counts = {direction: 0 for direction in DIRECTIONS}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(count_word_in_band, file_path, word, first_row, last_row, rows, cols, stride)
+                   for first_row, last_row in bands]
+        for future in futures:
+            for direction, count in future.result().items():
+                direction_counts[direction] += count
+
+    return direction_counts, sum(direction_counts.values())
+
+
+if __name__ == "__main__":
+    # Path to the input file
+    file_path = "input4.txt"  # Replace with your file name
+
+    # Define the word to search for
+    word_to_find = "XMAS"
+
+    # Read the grid and count occurrences
+    grid = read_grid(file_path)
+    direction_counts, result = count_word_in_grid_vectorized(grid, word_to_find)
+    #result = count_word_in_grid(grid, word_to_find)
+    #direction_counts, result = count_word_in_grid_tiled(file_path, word_to_find)
+    print(f"Part 1: The word '{word_to_find}' appears {result} times in the grid.")
+
+    # Several words at once with a single Aho-Corasick pass
+    #print(count_words_in_grid(grid, ["XMAS", "MAS", "SAMX"]))
+
+    # Count X-MAS occurrences in the example input
+    print(count_stencils(example_grid_with_centers, X_MAS_STENCILS))#example data
+
+    # Count X-MAS occurrences in the grid
+    result_with_diagonals = count_stencils(grid, X_MAS_STENCILS)
+    #result_with_diagonals = count_x_mas_by_centers(grid)
+    print(f"Part 2: Number of X-MAS patterns: {result_with_diagonals}")
 
-# Count X-MAS occurrences in the example input including diagonals
-result_with_diagonals = count_x_mas_by_centers(grid)
-print(f"Part 2: Number of X-MAS patterns: {result_with_diagonals}")
 
@@ -1,3 +1,6 @@
+from functools import cmp_to_key
+
+
 def parse_input(rules_and_updates):
     """
     Parses the input into ordering rules and updates.
@@ -25,13 +28,82 @@ def is_update_in_order(update, rules):
     return True
 
 
+class RuleSet:
+    """
+    The ordering rules indexed once as a set of (before, after) pairs.
+    """
+
+    def __init__(self, rules):
+        self.pairs = set(rules)
+        self.rank_cache = {}  # frozenset of pages -> {page: position in the sorted order}
+
+    def is_in_order(self, update):
+        """
+        Checks the update in O(k) by looking only at adjacent pages. This assumes
+        the rules restricted to the update's pages form a total order: every
+        pair has a rule and the rules are consistent, as in the puzzle input.
+        Cyclic rules are not detected (with 1|2, 2|3 and 3|1 the update 1,2,3
+        passes here but fails is_update_in_order). If an adjacent pair has no
+        rule, all pairs of the update are checked instead.
+        """
+        pairs = self.pairs
+        for x, y in zip(update, update[1:]):
+            if (y, x) in pairs:
+                return False
+            if (x, y) not in pairs:
+                return all((update[j], update[i]) not in pairs
+                           for i in range(len(update)) for j in range(i + 1, len(update)))
+        return True
+
+    def compare(self, x, y):
+        """
+        Comparator backed by the rule pairs: -1 if x must come before y, 1 if after.
+        """
+        if (x, y) in self.pairs:
+            return -1
+        if (y, x) in self.pairs:
+            return 1
+        return 0
+
+    def reorder(self, update):
+        """
+        Sorts the update with the rule comparator in O(k log k). The resulting
+        rank table is cached per page subset, so an update over a subset seen
+        before is ordered by a plain key lookup.
+        """
+        pages = frozenset(update)
+        ranks = self.rank_cache.get(pages)
+        if ranks is None:
+            ordered = sorted(update, key=cmp_to_key(self.compare))
+            if not self.is_in_order(ordered):
+                # The rules do not order every pair of these pages, use the full graph instead
+                ordered = topological_sort(update, [(x, y) for x, y in self.pairs if x in pages and y in pages])
+            ranks = {page: rank for rank, page in enumerate(ordered)}
+            self.rank_cache[pages] = ranks
+        return sorted(update, key=ranks.__getitem__)
+
+    def reorder_updates(self, updates):
+        """
+        Reorders a batch of updates, sharing the cached rank tables between them.
+        """
+        return [self.reorder(update) for update in updates]
+
+
+def as_rule_set(rules):
+    """
+    Returns rules as a RuleSet, building it only if a plain rule list was given.
+    """
+    return rules if isinstance(rules, RuleSet) else RuleSet(rules)
+
+
 def sum_middle_pages(rules, updates):
     """
     Determines the middle page number of each correctly-ordered update and sums them.
     """
+    rule_set = as_rule_set(rules)
     total = 0
     for update in updates:
-        if is_update_in_order(update, rules):
+        if rule_set.is_in_order(update):
             middle_index = len(update) // 2
             total += update[middle_index]
     return total
@@ -82,6 +154,7 @@ file_path = "input5.txt"
 
 # Parse the input from the file
 rules, updates = parse_file(file_path) #use real data
+rules = RuleSet(rules) #index the rules once for both parts
 
 # Parse input and calculate the result
 #rules, updates = parse_input(example_input) #use test data
@@ -133,18 +206,83 @@ def sum_middle_pages_incorrect_updates(rules, updates):
     """
     Identifies incorrectly-ordered updates, reorders them, and sums their middle pages.
     """
+    rule_set = as_rule_set(rules)
     total = 0
     for update in updates:
-        if not is_update_in_order(update, rules):
-            reordered = reorder_update(update, rules)
+        if not rule_set.is_in_order(update):
+            reordered = rule_set.reorder(update)
             middle_index = len(reordered) // 2
             total += reordered[middle_index]
     return total
 
 
+class LivePrintQueue:
+    """
+    Keeps the part 1 and part 2 sums current while rules keep arriving.
+    Updates are indexed by the pages they contain, so a new rule only
+    re-checks (and re-sorts) the updates holding both of its pages.
+    """
+
+    def __init__(self, rules, updates):
+        self.rule_set = RuleSet(as_rule_set(rules).pairs)
+        self.updates = updates
+        self.page_index = defaultdict(set)  # page -> indices of the updates containing it
+        for index, update in enumerate(updates):
+            for page in update:
+                self.page_index[page].add(index)
+
+        self.correct_total = 0
+        self.incorrect_total = 0
+        self.contributions = [self.evaluate(update) for update in updates]
+        for contribution in self.contributions:
+            self.apply(contribution, 1)
+
+    def apply(self, contribution, sign):
+        """
+        Adds (sign=1) or removes (sign=-1) one update's middle page from its total.
+        """
+        is_correct, middle_page = contribution
+        if is_correct:
+            self.correct_total += sign * middle_page
+        else:
+            self.incorrect_total += sign * middle_page
+
+    def evaluate(self, update):
+        """
+        Returns (is the update in order, middle page after reordering if needed).
+        """
+        if self.rule_set.is_in_order(update):
+            return True, update[len(update) // 2]
+        reordered = self.rule_set.reorder(update)
+        return False, reordered[len(reordered) // 2]
+
+    def add_rule(self, before, after):
+        """
+        Adds the rule before|after and adjusts both totals for the affected updates.
+        Returns the new (part 1, part 2) totals.
+        """
+        if (before, after) not in self.rule_set.pairs:
+            self.rule_set.pairs.add((before, after))
+
+            first, second = sorted((self.page_index.get(before, ()), self.page_index.get(after, ())), key=len)
+            for index in first:
+                if index not in second:
+                    continue
+                update = self.updates[index]
+                self.rule_set.rank_cache.pop(frozenset(update), None)
+                self.apply(self.contributions[index], -1)
+                self.contributions[index] = self.evaluate(update)
+                self.apply(self.contributions[index], 1)
+        return self.correct_total, self.incorrect_total
+
+
 # Parse input
 #rules, updates = parse_input(example_input) #use test data, by removing this line we use the real data from part 1
 
 # Calculate the sum of middle pages after reordering incorrect updates
 result_incorrect_updates = sum_middle_pages_incorrect_updates(rules, updates)
 print("Part 2: " + str(result_incorrect_updates))
+
+# Rules arriving over time: keep both sums current
+#live_queue = LivePrintQueue(rules, updates)
+#print(live_queue.add_rule(47, 53))
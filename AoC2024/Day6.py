@@ -1,87 +1,212 @@
---- Part Two ---
-While The Historians begin working around the guard's patrol route, you borrow their fancy device and step outside the lab. From the safety of a supply closet, you time travel through the last few months and record the nightly status of the lab's guard post on the walls of the closet.
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+import os
 
-Returning after what seems like only a few seconds to The Historians, they explain that the guard's patrol area is simply too large for them to safely search the lab without getting caught.
+# Guard directions in turning order: up, right, down, left
+DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+GUARD_SYMBOLS = "^>v<"
 
-Fortunately, they are pretty sure that adding a single new obstruction won't cause a time paradox. They'd like to place the new obstruction in such a way that the guard will get stuck in a loop, making the rest of the lab safe to search.
 
-To have the lowest chance of creating a time paradox, The Historians would like to know all of the possible positions for such an obstruction. The new obstruction can't be placed at the guard's starting position - the guard is there right now and would notice.
+def parse_lab_map(input_data):
+    """
+    Parses the lab map into its size, the obstacle positions and the guard's
+    starting state (x, y, direction index).
+    """
+    lines = input_data.strip().splitlines()
+    rows, cols = len(lines), len(lines[0])
+    obstacles = []
+    start = None
+    for y, line in enumerate(lines):
+        for x, char in enumerate(line):
+            if char == '#':
+                obstacles.append((x, y))
+            elif char in GUARD_SYMBOLS:
+                start = (x, y, GUARD_SYMBOLS.index(char))
+    return rows, cols, obstacles, start
 
-In the above example, there are only 6 different positions where a new obstruction would cause the guard to get stuck in a loop. The diagrams of these six situations use O to mark the new obstruction, | to show a position where the guard moves up/down, - to show a position where the guard moves left/right, and + to show a position where the guard moves both up/down and left/right.
 
-Option one, put a printing press next to the guard's starting position:
+class GuardPatrol:
+    """
+    Patrol engine over per-row and per-column sorted obstacle indexes. The guard
+    jumps from one obstruction to the next, so a walk costs O(turns * log n)
+    instead of one step per cell.
+    """
 
-....#.....
-....+---+#
-....|...|.
-..#.|...|.
-....|..#|.
-....|...|.
-.#.O^---+.
-........#.
-#.........
-......#...
-Option two, put a stack of failed suit prototypes in the bottom right quadrant of the mapped area:
+    def __init__(self, input_data):
+        self.rows, self.cols, obstacles, self.start = parse_lab_map(input_data)
+        self.row_obstacles = [[] for _ in range(self.rows)]  # y -> sorted x of obstacles
+        self.col_obstacles = [[] for _ in range(self.cols)]  # x -> sorted y of obstacles
+        for x, y in sorted(obstacles):
+            self.col_obstacles[x].append(y)
+        for x, y in sorted(obstacles, key=lambda position: (position[1], position[0])):
+            self.row_obstacles[y].append(x)
 
+        # One byte per (cell, direction) state, reused by every walk and cleared
+        # afterwards through the list of states it touched
+        self.turn_seen = bytearray(self.rows * self.cols * 4)
 
-....#.....
-....+---+#
-....|...|.
-..#.|...|.
-..+-+-+#|.
-..|.|.|.|.
-.#+-^-+-+.
-......O.#.
-#.........
-......#...
-Option three, put a crate of chimney-squeeze prototype fabric next to the standing desk in the bottom right quadrant:
+    def next_stop(self, x, y, direction, extra=None):
+        """
+        Moves the guard from (x, y) straight ahead until the next obstruction.
+        extra is an optional additional obstacle (x, y). Returns (x, y, blocked):
+        the last cell reached and whether an obstacle stopped the guard (False
+        means the guard walks off the map from that cell).
+        """
+        dx, dy = DIRECTIONS[direction]
+        if dx:
+            line, position, limit, step = self.row_obstacles[y], x, self.cols, dx
+            extra_on_line = extra[0] if extra is not None and extra[1] == y else None
+        else:
+            line, position, limit, step = self.col_obstacles[x], y, self.rows, dy
+            extra_on_line = extra[1] if extra is not None and extra[0] == x else None
 
-....#.....
-....+---+#
-....|...|.
-..#.|...|.
-..+-+-+#|.
-..|.|.|.|.
-.#+-^-+-+.
-.+----+O#.
-#+----+...
-......#...
-Option four, put an alchemical retroencabulator near the bottom left corner:
+        # Coordinate of the first obstacle ahead, or just past the edge of the map
+        if step < 0:
+            index = bisect_left(line, position)
+            hit = line[index - 1] if index else -1
+            if extra_on_line is not None and hit < extra_on_line < position:
+                hit = extra_on_line
+        else:
+            index = bisect_right(line, position)
+            hit = line[index] if index < len(line) else limit
+            if extra_on_line is not None and position < extra_on_line < hit:
+                hit = extra_on_line
 
-....#.....
-....+---+#
-....|...|.
-..#.|...|.
-..+-+-+#|.
-..|.|.|.|.
-.#+-^-+-+.
-..|...|.#.
-#O+---+...
-......#...
-Option five, put the alchemical retroencabulator a bit to the right instead:
+        stop = hit - step
+        blocked = 0 <= hit < limit
+        return (stop, y, blocked) if dx else (x, stop, blocked)
+
+    def walk(self, start=None, extra=None):
+        """
+        Follows the patrol from start (default: the guard's position) until the
+        guard leaves the map or repeats a turn. Returns (segments, loops) where
+        segments are the straight runs (x1, y1, x2, y2) walked.
+        Only turn states are recorded, encoded as (y * cols + x) * 4 + direction.
+        """
+        x, y, direction = start or self.start
+        cols = self.cols
+        turn_seen = self.turn_seen
+        touched = []
+        segments = []
+        while True:
+            next_x, next_y, blocked = self.next_stop(x, y, direction, extra)
+            segments.append((x, y, next_x, next_y))
+            if not blocked:
+                loops = False
+                break
+            x, y, direction = next_x, next_y, (direction + 1) % 4
+            state = (y * cols + x) * 4 + direction
+            if turn_seen[state]:
+                loops = True
+                break
+            turn_seen[state] = 1
+            touched.append(state)
+
+        for state in touched:
+            turn_seen[state] = 0
+        return segments, loops
+
+    def visited_cells(self, segments):
+        """
+        Marks the cells covered by the segments in a flat bytearray, one interval
+        (a contiguous or column-strided slice) per segment.
+        """
+        visited = bytearray(self.rows * self.cols)
+        for x1, y1, x2, y2 in segments:
+            first, last = sorted((y1 * self.cols + x1, y2 * self.cols + x2))
+            stride = 1 if y1 == y2 else self.cols
+            visited[first:last + 1:stride] = b"\x01" * ((last - first) // stride + 1)
+        return visited
+
+    def count_visited_positions(self):
+        """
+        Counts the distinct positions the guard visits before leaving the map.
+        """
+        segments, _ = self.walk()
+        return self.visited_cells(segments).count(1)
 
+    def obstruction_candidates(self):
+        """
+        Lists every cell on the original route except the start, together with the
+        guard's state (x, y, direction) just before it first steps onto that cell.
+        An obstruction anywhere else is never touched, and up to that state the
+        route is unchanged.
+        """
+        segments, _ = self.walk()
+        start_x, start_y, _ = self.start
+        seen = {(start_x, start_y)}
+        candidates = []
+        for x1, y1, x2, y2 in segments:
+            dx, dy = (x2 > x1) - (x2 < x1), (y2 > y1) - (y2 < y1)
+            if not dx and not dy:
+                continue  # blocked again right after turning
+            direction = DIRECTIONS.index((dx, dy))
+            x, y = x1, y1
+            while (x, y) != (x2, y2):
+                cell = (x + dx, y + dy)
+                if cell not in seen:
+                    seen.add(cell)
+                    candidates.append((cell, (x, y, direction)))
+                x, y = cell
+        return candidates
+
+    def causes_loop(self, obstruction, state):
+        """
+        Resumes the patrol from state with an extra obstruction and reports a loop.
+        """
+        _, loops = self.walk(state, obstruction)
+        return loops
+
+
+# Worker side of find_loop_obstructions: each process keeps its own copy of the patrol
+worker_patrol = None
+
+
+def init_loop_worker(patrol):
+    global worker_patrol
+    worker_patrol = patrol
+
+
+def loop_obstructions_in_chunk(candidates):
+    return [obstruction for obstruction, state in candidates if worker_patrol.causes_loop(obstruction, state)]
+
+
+def find_loop_obstructions(patrol, workers=None, chunk_size=256):
+    """
+    Returns the positions where a single new obstruction traps the guard in a loop.
+    Only cells on the original route are tried, each resumed from the state just
+    before the guard reaches it, spread over a process pool.
+    """
+    candidates = patrol.obstruction_candidates()
+    chunks = [candidates[i:i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+    obstructions = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_loop_worker, initargs=(patrol,)) as executor:
+        for chunk_result in executor.map(loop_obstructions_in_chunk, chunks):
+            obstructions.extend(chunk_result)
+    return obstructions
+
+
+# Example input
+example_map = """
 ....#.....
-....+---+#
-....|...|.
-..#.|...|.
-..+-+-+#|.
-..|.|.|.|.
-.#+-^-+-+.
-....|.|.#.
-#..O+-+...
+.........#
+..........
+..#.......
+.......#..
+..........
+.#..^.....
+........#.
+#.........
 ......#...
-Option six, put a tank of sovereign glue right next to the tank of universal solvent:
+"""
 
-....#.....
-....+---+#
-....|...|.
-..#.|...|.
-..+-+-+#|.
-..|.|.|.|.
-.#+-^-+-+.
-.+----++#.
-#+----++..
-......#O..
-It doesn't really matter what you choose to use as an obstacle so long as you and The Historians can put it into position without the guard noticing. The important thing is having enough options that you can find one that minimizes time paradoxes, and in this example, there are 6 different positions you could choose.
-
-You need to get the guard stuck in a loop by adding a single new obstruction. How many different positions could you choose for this obstruction?
\ No newline at end of file
+if __name__ == "__main__":
+    file_path = "input6.txt"
+    input_data = example_map
+    if os.path.exists(file_path):
+        with open(file_path, 'r') as file:
+            input_data = file.read()
+
+    patrol = GuardPatrol(input_data)
+    print("Part 1: " + str(patrol.count_visited_positions()))
+    print("Part 2: " + str(len(find_loop_obstructions(patrol))))
@@ -1,4 +1,8 @@
+import heapq
 import os
+from bisect import bisect_right
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from itertools import product
 
 def parse_calibration_input(input_data):
@@ -14,38 +18,122 @@ def parse_calibration_input(input_data):
     return equations
 
 
+# Operator registry: symbol -> Operator(apply, undo). apply(left, right) evaluates
+# the operator, undo(target, right) returns the left value that would produce
+# target (ANY_PREVIOUS if every left value does, None if none does).
+Operator = namedtuple("Operator", ["apply", "undo"])
+ANY_PREVIOUS = object()
+POWERS_OF_TEN = [10]
+
+
+def power_above(value):
+    """
+    Returns the smallest power of ten greater than value (10 for 0), from a
+    table that only grows when a longer number shows up.
+    """
+    while POWERS_OF_TEN[-1] <= value:
+        POWERS_OF_TEN.append(POWERS_OF_TEN[-1] * 10)
+    return POWERS_OF_TEN[bisect_right(POWERS_OF_TEN, value)]
+
+
+def undo_addition(target, right):
+    return target - right if target >= right else None
+
+
+def undo_multiplication(target, right):
+    if right == 0:
+        return ANY_PREVIOUS if target == 0 else None
+    return target // right if target % right == 0 else None
+
+
+def concatenate(left, right):
+    return left * power_above(right) + right
+
+
+def undo_concatenation(target, right):
+    # target has to end with the digits of right
+    power = power_above(right)
+    if target >= right and (target - right) % power == 0:
+        return (target - right) // power
+    return None
+
+
+OPERATORS = {
+    "+": Operator(lambda left, right: left + right, undo_addition),
+    "*": Operator(lambda left, right: left * right, undo_multiplication),
+    "||": Operator(concatenate, undo_concatenation),
+}
+PART1_OPERATORS = ("+", "*")
+PART2_OPERATORS = ("+", "*", "||")
+
+
+def register_operator(symbol, apply, undo=None):
+    """
+    Adds a custom operator. Without undo, equations using it are checked by the
+    forward search instead of the reverse solver.
+    """
+    OPERATORS[symbol] = Operator(apply, undo)
+
+
 def evaluate_expression(numbers, operators):
     """
     Evaluates the expression formed by the numbers and operators left-to-right.
     """
     result = numbers[0]
     for i, operator in enumerate(operators):
-        if operator == '+':
-            result += numbers[i + 1]
-        elif operator == '*':
-            result *= numbers[i + 1]
+        result = OPERATORS[operator].apply(result, numbers[i + 1])
     return result
 
 
-def is_valid_equation(test_value, numbers):
+def is_valid_equation(test_value, numbers, operators=PART1_OPERATORS):
     """
-    Checks if a test value can be obtained by inserting any combination of + and * between the numbers.
+    Checks if a test value can be obtained by inserting any combination of the operators between the numbers.
     """
     num_operators = len(numbers) - 1
-    for operators in product("+*", repeat=num_operators):
-        if evaluate_expression(numbers, operators) == test_value:
+    for combination in product(operators, repeat=num_operators):
+        if evaluate_expression(numbers, combination) == test_value:
+            return True
+    return False
+
+
+def can_produce(target, numbers, index, operators):
+    """
+    Checks if numbers[:index + 1] can produce target by undoing the last operation
+    with each operator (subtraction for +, exact division for *, suffix stripping
+    for ||). Branches that cannot work are dropped straight away.
+    """
+    last = numbers[index]
+    if index == 0:
+        return target == last
+
+    for operator in operators:
+        previous = operator.undo(target, last)
+        if previous is ANY_PREVIOUS:
+            return True
+        if previous is not None and can_produce(previous, numbers, index - 1, operators):
             return True
     return False
 
 
-def calculate_total_calibration(input_data):
+def is_valid_equation_reverse(test_value, numbers, operators=PART1_OPERATORS):
+    """
+    Same result as is_valid_equation, but works backwards from the test value
+    instead of trying every operator combination.
+    """
+    registered = [OPERATORS[symbol] for symbol in operators]
+    if any(operator.undo is None for operator in registered):
+        return is_valid_equation(test_value, numbers, operators)
+    return can_produce(test_value, numbers, len(numbers) - 1, registered)
+
+
+def calculate_total_calibration(input_data, operators=PART1_OPERATORS):
     """
     Calculates the total calibration result by summing test values of valid equations.
     """
     equations = parse_calibration_input(input_data)
     total_calibration = 0
     for test_value, numbers in equations:
-        if is_valid_equation(test_value, numbers):
+        if is_valid_equation_reverse(test_value, numbers, operators):
             total_calibration += test_value
     return total_calibration
 
@@ -63,7 +151,7 @@ example_calibration_input = """
 292: 11 6 16 20
 """
 
-def calculate_total_calibration_from_file_if_exists(file_path):
+def calculate_total_calibration_from_file_if_exists(file_path, operators=PART1_OPERATORS):
     """
     Reads calibration data from a file and calculates the total calibration result.
     Only runs if the file exists.
@@ -71,16 +159,61 @@ def calculate_total_calibration_from_file_if_exists(file_path):
     if os.path.exists(file_path):
         with open(file_path, 'r') as file:
             input_data = file.read()
-        return calculate_total_calibration(input_data)
+        return calculate_total_calibration(input_data, operators)
     else:
         return None
 
 
-# File path for input7.txt
-file_path = "input7.txt"
+def balance_equations(equations, chunks):
+    """
+    Splits the equations into chunks with roughly equal total operand counts:
+    longest equations first, each into the currently lightest chunk.
+    """
+    heap = [(0, index, []) for index in range(chunks)]
+    for equation in sorted(equations, key=lambda equation: len(equation[1]), reverse=True):
+        weight, index, chunk = heapq.heappop(heap)
+        chunk.append(equation)
+        heapq.heappush(heap, (weight + len(equation[1]), index, chunk))
+    return [chunk for _, _, chunk in heap if chunk]
+
+
+def sum_valid_equations(equations, operators=PART1_OPERATORS):
+    """
+    Worker: sums the test values of the valid equations in one chunk.
+    """
+    return sum(test_value for test_value, numbers in equations
+               if is_valid_equation_reverse(test_value, numbers, operators))
+
+
+def calculate_total_calibration_parallel(input_data, operators=PART1_OPERATORS, workers=None):
+    """
+    Parses the input once, spreads the equations over a process pool in chunks
+    balanced by operand count and sums the partial calibration results.
+    Custom operators must be registered at import time to be seen by the workers.
+    """
+    equations = parse_calibration_input(input_data)
+    workers = workers or os.cpu_count() or 1
+    chunks = balance_equations(equations, workers * 4)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(sum_valid_equations, chunks, [operators] * len(chunks)))
+
+
+if __name__ == "__main__":
+    # File path for input7.txt
+    file_path = "input7.txt"
+
+    # Calculate results for both the example input and input7.txt (if available)
+    example_result = calculate_total_calibration(example_calibration_input)
+    file_result = calculate_total_calibration_from_file_if_exists(file_path)
+
+    print("Part 1:" + str(example_result), str(file_result))
+
+    # Part 2 adds the || concatenation operator
+    example_result = calculate_total_calibration(example_calibration_input, PART2_OPERATORS)
+    file_result = calculate_total_calibration_from_file_if_exists(file_path, PART2_OPERATORS)
 
-# Calculate results for both the example input and input7.txt (if available)
-example_result = calculate_total_calibration(example_calibration_input)
-file_result = calculate_total_calibration_from_file_if_exists(file_path)
+    # Large equation sets: parse once and spread the equations over a process pool
+    #with open(file_path, 'r') as file:
+    #    file_result = calculate_total_calibration_parallel(file.read(), PART2_OPERATORS)
 
-print("Part 1:" + str(example_result), str(file_result))
+    print("Part 2:" + str(example_result), str(file_result))
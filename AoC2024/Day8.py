@@ -0,0 +1,114 @@
+import numpy as np
+import os
+
+
+def index_antennas(input_data):
+    """
+    Parses the map once and groups the antenna positions by frequency.
+    Returns rows, cols and {frequency: int64 array of (y, x) positions}.
+    """
+    lines = input_data.strip().splitlines()
+    rows, cols = len(lines), len(lines[0])
+    grid = np.frombuffer("".join(lines).encode(), dtype=np.uint8).reshape(rows, cols)
+
+    positions = np.argwhere(grid != ord('.'))
+    codes = grid[positions[:, 0], positions[:, 1]]
+    order = np.argsort(codes, kind="stable")
+    frequencies, counts = np.unique(codes[order], return_counts=True)
+    groups = np.split(positions[order], np.cumsum(counts)[:-1])
+    return rows, cols, {chr(code): group for code, group in zip(frequencies, groups)}
+
+
+def antenna_pairs(positions):
+    """
+    Returns the two ends (a, b) of every unordered pair of antennas of one frequency.
+    """
+    first, second = np.triu_indices(len(positions), 1)
+    return positions[first], positions[second]
+
+
+def pair_antinodes(positions):
+    """
+    Antinodes of the two-point variant: 2a - b and 2b - a for every pair.
+    """
+    a, b = antenna_pairs(positions)
+    return np.concatenate((2 * a - b, 2 * b - a))
+
+
+def resonant_antinodes(positions, rows, cols):
+    """
+    Antinodes of the resonant-harmonics variant: every grid point a + t * step on
+    the line through a pair, with step the pair difference reduced by its gcd.
+    The valid range of t is worked out per pair, so only points on the map are
+    generated.
+    """
+    a, b = antenna_pairs(positions)
+    if len(a) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    step = b - a
+    step //= np.gcd(step[:, 0], step[:, 1])[:, None]
+
+    # 0 <= a + t * step <= limit - 1 for both coordinates
+    limits = np.array([rows - 1, cols - 1])
+    safe_step = np.where(step == 0, 1, step)
+    low_bound = np.where(step > 0, -a, limits - a)
+    high_bound = np.where(step > 0, limits - a, -a)
+    t_low = np.where(step == 0, -rows - cols, -(-low_bound // safe_step)).max(axis=1)
+    t_high = np.where(step == 0, rows + cols, high_bound // safe_step).min(axis=1)
+
+    # Expand every pair's [t_low, t_high] range without a Python loop
+    lengths = t_high - t_low + 1
+    pair_index = np.repeat(np.arange(len(a)), lengths)
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    t = t_low[pair_index] + offsets
+    return a[pair_index] + t[:, None] * step[pair_index]
+
+
+def antinode_grid(rows, cols, antennas, resonant=False):
+    """
+    Marks the antinodes of all frequencies in a flat boolean grid, which also
+    takes care of deduplication.
+    """
+    marked = np.zeros(rows * cols, dtype=bool)
+    for positions in antennas.values():
+        if resonant:
+            points = resonant_antinodes(positions, rows, cols)
+        else:
+            points = pair_antinodes(positions)
+        inside = (points[:, 0] >= 0) & (points[:, 0] < rows) & (points[:, 1] >= 0) & (points[:, 1] < cols)
+        points = points[inside]
+        marked[points[:, 0] * cols + points[:, 1]] = True
+    return marked
+
+
+def count_antinodes(input_data, resonant=False):
+    """
+    Counts the unique antinode locations on the map.
+    """
+    rows, cols, antennas = index_antennas(input_data)
+    return int(antinode_grid(rows, cols, antennas, resonant).sum())
+
+
+# Example input
+example_map = """
+............
+........0...
+.....0......
+.......0....
+....0.......
+......A.....
+............
+............
+........A...
+.........A..
+............
+............
+"""
+file_path = "input8.txt"
+input_data = example_map
+if os.path.exists(file_path):
+    with open(file_path, 'r') as file:
+        input_data = file.read()
+
+print("Part 1: " + str(count_antinodes(input_data)))
+print("Part 2: " + str(count_antinodes(input_data, resonant=True)))
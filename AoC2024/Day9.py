@@ -0,0 +1,111 @@
+import heapq
+import os
+
+
+def parse_disk_map(disk_map):
+    """
+    Parses the dense disk map into runs instead of single blocks.
+    Returns the files as [start, length] (index = file ID) and the free spans
+    as (start, length), both in disk order. Free spans separated only by a
+    zero-length file are merged into one.
+    """
+    files = []
+    free_spans = []
+    position = 0
+    for index, digit in enumerate(disk_map.strip()):
+        length = int(digit)
+        if index % 2 == 0:
+            files.append([position, length])
+        elif length:
+            if free_spans and sum(free_spans[-1]) == position:
+                # Only a zero-length file separated this span from the previous one
+                free_spans[-1] = (free_spans[-1][0], free_spans[-1][1] + length)
+            else:
+                free_spans.append((position, length))
+        position += length
+    return files, free_spans
+
+
+def run_checksum(file_id, start, length):
+    """
+    Checksum of a run of `length` blocks of one file starting at `start`:
+    file_id * (start + (start + 1) + ... + (start + length - 1)).
+    """
+    return file_id * (length * start + length * (length - 1) // 2)
+
+
+def compact_blocks_checksum(disk_map):
+    """
+    Part 1: moves single blocks from the end of the disk into the leftmost free
+    blocks. Works on whole runs, moving as many blocks as fit at once.
+    """
+    files, free_spans = parse_disk_map(disk_map)
+    remaining = [length for _, length in files]  # blocks still at each file's original place
+    checksum = 0
+    right = len(files) - 1
+
+    for start, length in free_spans:
+        while length and right >= 0 and files[right][0] > start:
+            moved = min(length, remaining[right])
+            checksum += run_checksum(right, start, moved)
+            start += moved
+            length -= moved
+            remaining[right] -= moved
+            if remaining[right] == 0:
+                right -= 1
+        if right < 0 or files[right][0] <= start:
+            break
+
+    # The blocks that were not moved stay at the front of their original run
+    for file_id, (start, _) in enumerate(files):
+        checksum += run_checksum(file_id, start, remaining[file_id])
+    return checksum
+
+
+def compact_files_checksum(disk_map):
+    """
+    Part 2: moves whole files, highest ID first, into the leftmost free span
+    that fits them. Free spans are kept in one min-heap of start offsets per
+    span length, so a file finds its slot by peeking one heap per length.
+    """
+    files, free_spans = parse_disk_map(disk_map)
+    # Merged spans can be longer than 9 blocks
+    spans_by_length = [[] for _ in range(max((length for _, length in free_spans), default=0) + 1)]
+    for start, length in free_spans:
+        spans_by_length[length].append(start)
+    for heap in spans_by_length:
+        heapq.heapify(heap)
+
+    checksum = 0
+    for file_id in range(len(files) - 1, -1, -1):
+        file_start, file_length = files[file_id]
+        if file_length == 0:
+            continue  # adds nothing to the checksum wherever it goes
+
+        # Leftmost span that is long enough and lies before the file
+        best_start, best_length = file_start, 0
+        for length in range(file_length, len(spans_by_length)):
+            heap = spans_by_length[length]
+            if heap and heap[0] < best_start:
+                best_start, best_length = heap[0], length
+
+        if best_length:
+            heapq.heappop(spans_by_length[best_length])
+            if best_length > file_length:
+                heapq.heappush(spans_by_length[best_length - file_length], best_start + file_length)
+            file_start = best_start
+
+        checksum += run_checksum(file_id, file_start, file_length)
+    return checksum
+
+
+# Example input
+example_disk_map = "2333133121414131402"
+file_path = "input9.txt"
+disk_map = example_disk_map
+if os.path.exists(file_path):
+    with open(file_path, 'r') as file:
+        disk_map = file.read()
+
+print("Part 1: " + str(compact_blocks_checksum(disk_map)))
+print("Part 2: " + str(compact_files_checksum(disk_map)))